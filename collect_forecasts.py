@@ -22,7 +22,7 @@ from datetime import date
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from src.collector import collect_forecasts
+from src.collector import collect_forecasts, DEFAULT_MAX_WORKERS
 from src.utils import setup_logging
 
 
@@ -85,7 +85,15 @@ Examples:
         default=None,
         help="Filter to a single city name (e.g., 'Sydney')",
     )
-    
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Number of concurrent collection workers (default: {DEFAULT_MAX_WORKERS}, "
+             f"or set BOM_COLLECT_WORKERS)",
+    )
+
     return parser.parse_args()
 
 
@@ -97,10 +105,11 @@ def main() -> int:
     """
     args = parse_args()
     
-    # Configure logging level
+    # Configure logging once for the whole process; module loggers
+    # propagate to the root handler installed here
     logger = setup_logging()
     if args.verbose:
-        logger.setLevel(logging.DEBUG)
+        logging.getLogger().setLevel(logging.DEBUG)
     
     # Get current date in AEDT
     aedt_date = get_aedt_date()
@@ -112,6 +121,7 @@ def main() -> int:
         data_dir=args.data,
         collection_date=aedt_date,
         city_filter=args.city,
+        max_workers=args.workers,
     )
     
     # Report results
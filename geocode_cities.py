@@ -2,11 +2,18 @@
 """
 Geocode Australian cities from locations.json and save as GeoJSON.
 Uses Nominatim (OpenStreetMap) for geocoding.
+
+Results are cached in a JSON file keyed by (city, state), so reruns only
+hit the geocoder for cities that haven't been resolved yet. The request
+rate is configurable: the public Nominatim policy allows 1 req/s (the
+default), while a self-hosted or commercial endpoint can go much faster.
 """
 
-import json
+import argparse
 import time
 from pathlib import Path
+
+from src.utils import json_dumps, json_loads
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 
@@ -39,28 +46,88 @@ def geocode_city(geolocator: Nominatim, city: str, state: str) -> tuple[float, f
         return None
 
 
+def load_cache(cache_path: Path) -> dict[str, list[float]]:
+    """Load the geocoding cache, keyed by 'City|STATE'."""
+    if cache_path.exists():
+        return json_loads(cache_path.read_bytes())
+    return {}
+
+
+def save_cache(cache_path: Path, cache: dict[str, list[float]]) -> None:
+    """Save the geocoding cache."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json_dumps(cache))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Geocode cities from locations.json")
+    parser.add_argument(
+        "--locations",
+        type=Path,
+        default=Path("data/locations.json"),
+        help="Path to locations.json (default: data/locations.json)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/cities.geojson"),
+        help="Output GeoJSON path (default: data/cities.geojson)",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=Path("data/geocode_cache.json"),
+        help="Geocoding cache path (default: data/geocode_cache.json)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="Max geocoding requests per second (default: 1.0, the public "
+             "Nominatim policy; raise for self-hosted endpoints)",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     # Load locations
-    locations_path = Path("data/locations.json")
-    with open(locations_path) as f:
-        data = json.load(f)
-    
+    data = json_loads(args.locations.read_bytes())
+
     locations = data["locations"]
     print(f"Geocoding {len(locations)} cities...")
-    
+
+    # Previously resolved cities are served from the cache, so only new
+    # cities pay the geocoding round-trip (and the rate-limit sleep)
+    cache = load_cache(args.cache)
+    request_interval = 1.0 / args.rate if args.rate > 0 else 0.0
+
     # Initialize geocoder with a user agent (required by Nominatim)
     geolocator = Nominatim(user_agent="australian_weather_geocoder")
-    
+
     # Build GeoJSON features
     features = []
+    cache_misses = 0
     for loc in locations:
         city = loc["city_name"]
         state = loc["state"]
         product_id = loc["product_id"]
-        
-        print(f"Geocoding: {city}, {state}...")
-        coords = geocode_city(geolocator, city, state)
-        
+        cache_key = f"{city}|{state}"
+
+        if cache_key in cache:
+            coords = tuple(cache[cache_key])
+        else:
+            print(f"Geocoding: {city}, {state}...")
+            coords = geocode_city(geolocator, city, state)
+            cache_misses += 1
+
+            if coords:
+                cache[cache_key] = list(coords)
+
+            # Respect the geocoder's rate limit
+            time.sleep(request_interval)
+
         if coords:
             feature = {
                 "type": "Feature",
@@ -75,22 +142,20 @@ def main():
                 },
             }
             features.append(feature)
-        
-        # Respect Nominatim's usage policy (1 request per second)
-        time.sleep(1)
-    
+
+    save_cache(args.cache, cache)
+
     # Create GeoJSON structure
     geojson = {
         "type": "FeatureCollection",
         "features": features,
     }
-    
-    # Save to file
-    output_path = Path("data/cities.geojson")
-    with open(output_path, "w") as f:
-        json.dump(geojson, f, indent=2)
-    
-    print(f"\nDone! Saved {len(features)} cities to {output_path}")
+
+    # Save to file (insertion order preserved to match the existing file)
+    args.output.write_text(json_dumps(geojson, sort_keys=False))
+
+    print(f"\nDone! Saved {len(features)} cities to {args.output} "
+          f"({len(locations) - cache_misses} from cache)")
 
 
 if __name__ == "__main__":
@@ -4,22 +4,105 @@ This module provides the main orchestration logic for collecting
 weather forecasts from the BOM FTP server for all configured locations.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import time
 from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
 from typing import Optional
 
 from src.config import load_config, LocationConfig
-from src.ftp_fetcher import fetch_forecast_xml
+from src.ftp_fetcher import fetch_forecast_xml, fetch_product_mdtm, FtpConnectionPool
 from src.xml_parser import parse_forecast_xml
 from src.merger import merge_forecast, archive_old_records
 from src.file_io import get_location_file_path, get_archive_file_path, read_location_file, write_location_file, write_archive_file
-from src.utils import setup_logging
+from src.utils import json_loads, json_dumps
+logger = logging.getLogger(__name__)
 
-logger = setup_logging()
+# Number of concurrent collection workers. The workload is I/O-bound (FTP
+# latency dominates), so a modest pool cuts wall-clock time roughly linearly.
+DEFAULT_MAX_WORKERS = int(os.environ.get("BOM_COLLECT_WORKERS", "8"))
 
+# Per-product FTP modification times from the previous run, used to skip
+# downloads for products BOM hasn't re-issued since
+STATE_FILENAME = ".state.json"
 
-@dataclass
+
+def _load_collection_state(data_dir: Path) -> dict[str, str]:
+    """Load the product_id -> MDTM timestamp map from the previous run.
+
+    Args:
+        data_dir: Base directory for data files
+
+    Returns:
+        Mapping of product_id to FTP modification timestamp; empty if no
+        state file exists or it can't be read
+    """
+    state_path = data_dir / STATE_FILENAME
+    try:
+        state = json_loads(state_path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable collection state {state_path}: {e}")
+        return {}
+
+    if not isinstance(state, dict):
+        return {}
+    return {k: v for k, v in state.items() if isinstance(v, str)}
+
+
+def _save_collection_state(data_dir: Path, state: dict[str, str]) -> None:
+    """Atomically persist the product_id -> MDTM timestamp map.
+
+    Args:
+        data_dir: Base directory for data files
+        state: Mapping of product_id to FTP modification timestamp
+    """
+    state_path = data_dir / STATE_FILENAME
+    tmp_path = state_path.with_suffix(state_path.suffix + ".tmp")
+    try:
+        data_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json_dumps(state), encoding="utf-8")
+        os.replace(tmp_path, state_path)
+    except Exception as e:
+        # State is an optimisation only; a failed save just means the
+        # next run re-downloads everything
+        logger.warning(f"Failed to save collection state {state_path}: {e}")
+
+
+def _fetch_location(
+    location: LocationConfig,
+    ftp_pool: Optional[FtpConnectionPool],
+    last_mdtm: Optional[str],
+) -> tuple[Optional[bytes], Optional[str]]:
+    """Fetch a location's XML unless BOM hasn't re-issued it.
+
+    Queries the product's FTP modification time first; when it matches
+    the timestamp recorded by the previous run, the download is skipped.
+
+    Args:
+        location: Location configuration
+        ftp_pool: Optional pool of persistent FTP connections
+        last_mdtm: Modification timestamp recorded for this product by
+            the previous run, if any
+
+    Returns:
+        Tuple of (xml_content, mdtm). xml_content is None both when the
+        product is unchanged and when the fetch failed; the caller tells
+        the cases apart by comparing mdtm against last_mdtm.
+    """
+    mdtm = fetch_product_mdtm(location.product_id, ftp_pool)
+    if mdtm is not None and mdtm == last_mdtm:
+        logger.debug("Skipping unchanged product %s (MDTM %s)", location.product_id, mdtm)
+        return None, mdtm
+
+    return fetch_forecast_xml(location.product_id, ftp_pool=ftp_pool), mdtm
+
+
+@dataclass(slots=True)
 class CollectionResult:
     """Summary of a forecast collection run.
     
@@ -39,31 +122,57 @@ def collect_single_location(
     location: LocationConfig,
     data_dir: Path,
     collection_date: date,
+    ftp_pool: Optional[FtpConnectionPool] = None,
 ) -> Optional[str]:
     """Collect forecast for a single location.
-    
+
     Fetches XML from BOM FTP, parses it, merges with existing data,
     applies retention policy, and writes to JSON file.
-    
+
     Args:
         location: Location configuration
         data_dir: Base directory for data files
         collection_date: Date of this collection
-        
+        ftp_pool: Optional pool of persistent FTP connections to reuse
+
+    Returns:
+        Error message if failed, None if successful
+    """
+    # Step 1: Fetch XML from BOM FTP
+    logger.debug("Fetching forecast for %s (%s)", location.city_name, location.product_id)
+    xml_content = fetch_forecast_xml(location.product_id, ftp_pool=ftp_pool)
+
+    # Steps 2-7: Parse, merge, and write
+    return _process_location(location, xml_content, data_dir, collection_date)
+
+
+def _process_location(
+    location: LocationConfig,
+    xml_content: Optional[bytes],
+    data_dir: Path,
+    collection_date: date,
+) -> Optional[str]:
+    """Parse, merge, and write a fetched forecast for one location.
+
+    This is the CPU/disk half of collection, split from the network
+    fetch so the two can run on different threads.
+
+    Args:
+        location: Location configuration
+        xml_content: Raw XML bytes from the fetch, or None if it failed
+        data_dir: Base directory for data files
+        collection_date: Date of this collection
+
     Returns:
         Error message if failed, None if successful
     """
     product_id = location.product_id
     city_name = location.city_name
     state = location.state
-    
-    # Step 1: Fetch XML from BOM FTP
-    logger.debug(f"Fetching forecast for {city_name} ({product_id})")
-    xml_content = fetch_forecast_xml(product_id)
-    
+
     if xml_content is None:
         return f"Failed to fetch XML for {city_name} ({product_id})"
-    
+
     # Step 2: Parse XML
     parsed_forecast = parse_forecast_xml(xml_content)
     
@@ -100,7 +209,7 @@ def collect_single_location(
             logger.warning(f"Failed to write archive file for {city_name} ({product_id}): {e}")
             # Don't fail the entire collection if archive write fails
     
-    logger.debug(f"Successfully collected forecast for {city_name}")
+    logger.debug("Successfully collected forecast for %s", city_name)
     return None
 
 
@@ -109,27 +218,31 @@ def collect_forecasts(
     data_dir: Path,
     collection_date: Optional[date] = None,
     city_filter: Optional[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> CollectionResult:
     """Main entry point for forecast collection.
-    
-    Loads configuration, iterates through all locations, and collects
-    forecasts for each. Errors are logged and processing continues
-    for remaining locations.
-    
+
+    Loads configuration and collects forecasts for all locations using
+    a thread pool (each location is an independent FTP fetch plus a write
+    to its own file, so locations can be processed concurrently). Errors
+    are logged and processing continues for remaining locations.
+
     Args:
         config_path: Path to the locations.json configuration file
         data_dir: Base directory for data files (e.g., Path("data"))
         collection_date: Date of this collection (defaults to today)
         city_filter: Optional city name to filter to a single location
-        
+        max_workers: Number of concurrent collection workers
+
     Returns:
         CollectionResult with summary of processed locations
         
     Requirements: 2.1, 2.4, 2.5, 6.1, 6.2, 6.3, 6.5
     """
     from datetime import datetime
-    
+
     start_time = datetime.now()
+    start_perf = time.perf_counter()
     
     if collection_date is None:
         collection_date = date.today()
@@ -164,31 +277,83 @@ def collect_forecasts(
     # Log start time and location count (Requirement 6.2)
     logger.info(
         f"Starting forecast collection at {start_time.isoformat()} "
-        f"for {result.total} locations"
+        f"for {result.total} locations ({max_workers} workers)"
     )
     
     if result.total == 0:
         logger.warning("No locations found in configuration")
         return result
     
-    # Process each location
-    for i, location in enumerate(locations, 1):
-        logger.info(f"Processing location {i}/{result.total}: {location.city_name} ({location.product_id})")
-        
-        error = collect_single_location(location, data_dir, collection_date)
-        
-        if error is None:
-            result.successes += 1
-            logger.info(f"Successfully collected forecast for {location.city_name}")
-        else:
-            result.failures += 1
-            result.errors.append(error)
-            # Error already logged in collect_single_location, but add context
-            logger.error(f"Failed to collect forecast for {location.city_name}: {error}")
-    
-    # Log completion summary (Requirement 6.3)
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    # Producer/consumer split: worker threads only do the network fetch
+    # (pure I/O wait), while parsing, merging, and disk writes happen on
+    # this thread as results complete. That keeps the FTP connections
+    # saturated instead of having workers alternate between waiting on
+    # the network and holding the GIL for parse work. Only this thread
+    # touches the CollectionResult, so no lock is needed.
+    completed = 0
+
+    # FTP modification times from the previous run; products whose MDTM
+    # hasn't moved are skipped without downloading
+    state = _load_collection_state(data_dir)
+    new_state = dict(state)
+
+    # One persistent FTP connection per worker, reused across locations
+    # to avoid paying the FTP connect/login handshake per fetch.
+    ftp_pool = FtpConnectionPool(size=min(max_workers, result.total))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_location = {
+                executor.submit(
+                    _fetch_location, location, ftp_pool, state.get(location.product_id)
+                ): location
+                for location in locations
+            }
+
+            for future in as_completed(future_to_location):
+                location = future_to_location[future]
+                unchanged = False
+
+                try:
+                    xml_content, mdtm = future.result()
+                    if xml_content is None and mdtm is not None and mdtm == state.get(location.product_id):
+                        unchanged = True
+                        error = None
+                    else:
+                        error = _process_location(location, xml_content, data_dir, collection_date)
+                        if error is None and mdtm is not None:
+                            new_state[location.product_id] = mdtm
+                except Exception as e:
+                    error = f"Unexpected error for {location.city_name} ({location.product_id}): {e}"
+
+                completed += 1
+                if error is None:
+                    result.successes += 1
+                else:
+                    result.failures += 1
+                    result.errors.append(error)
+
+                # Lazy %-style formatting: the string is only built if the
+                # log level is enabled, which matters in this hot loop
+                if unchanged:
+                    logger.info("[%d/%d] Forecast unchanged for %s, skipped",
+                                completed, result.total, location.city_name)
+                elif error is None:
+                    logger.info("[%d/%d] Successfully collected forecast for %s",
+                                completed, result.total, location.city_name)
+                else:
+                    # Error already logged in _process_location, but add context
+                    logger.error("[%d/%d] Failed to collect forecast for %s: %s",
+                                 completed, result.total, location.city_name, error)
+    finally:
+        ftp_pool.close_all()
+
+    if new_state != state:
+        _save_collection_state(data_dir, new_state)
+    
+    # Log completion summary (Requirement 6.3); monotonic clock for the
+    # duration so wall-clock adjustments can't skew it
+    duration = time.perf_counter() - start_perf
     
     logger.info(
         f"Collection completed in {duration:.1f}s - "
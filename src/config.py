@@ -6,21 +6,24 @@ from the JSON configuration file.
 
 from dataclasses import dataclass
 from pathlib import Path
-import json
 import logging
+import mmap
 
-from src.utils import setup_logging
+from src.utils import json_loads
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
 
 # Valid Australian state/territory abbreviations
 VALID_STATES = frozenset({"NSW", "VIC", "QLD", "SA", "WA", "TAS", "NT", "ACT"})
 
+# Sorted once for error messages rather than per invalid entry
+_SORTED_VALID_STATES = sorted(VALID_STATES)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class LocationConfig:
     """Represents a BOM weather location configuration.
-    
+
     Attributes:
         product_id: BOM Product ID (e.g., "IDD10161")
         city_name: City name (e.g., "Alice Springs")
@@ -44,36 +47,40 @@ def validate_config_entry(entry: dict) -> LocationConfig | None:
     Returns:
         LocationConfig if valid, None if invalid
     """
-    # Check required fields exist and are non-empty strings
-    product_id = entry.get("product_id", "")
-    city_name = entry.get("city_name", "")
-    state = entry.get("state", "")
-    
-    if not isinstance(product_id, str) or not product_id.strip():
+    # Normalize each field exactly once; the stripped values are reused
+    # for both validation and the resulting LocationConfig
+    raw_product_id = entry.get("product_id")
+    raw_city_name = entry.get("city_name")
+    raw_state = entry.get("state")
+
+    product_id = raw_product_id.strip() if isinstance(raw_product_id, str) else ""
+    city_name = raw_city_name.strip() if isinstance(raw_city_name, str) else ""
+    state = raw_state.strip().upper() if isinstance(raw_state, str) else ""
+
+    if not product_id:
         logger.warning(f"Invalid config entry: missing or empty product_id: {entry}")
         return None
-    
-    if not isinstance(city_name, str) or not city_name.strip():
+
+    if not city_name:
         logger.warning(f"Invalid config entry: missing or empty city_name: {entry}")
         return None
-    
-    if not isinstance(state, str) or not state.strip():
+
+    if not state:
         logger.warning(f"Invalid config entry: missing or empty state: {entry}")
         return None
-    
+
     # Validate state abbreviation
-    state_upper = state.strip().upper()
-    if state_upper not in VALID_STATES:
+    if state not in VALID_STATES:
         logger.warning(
-            f"Invalid config entry: invalid state '{state}' for {city_name}. "
-            f"Valid states: {sorted(VALID_STATES)}"
+            f"Invalid config entry: invalid state '{raw_state}' for {city_name}. "
+            f"Valid states: {_SORTED_VALID_STATES}"
         )
         return None
-    
+
     return LocationConfig(
-        product_id=product_id.strip(),
-        city_name=city_name.strip(),
-        state=state_upper
+        product_id=product_id,
+        city_name=city_name,
+        state=state
     )
 
 
@@ -94,9 +101,21 @@ def load_config(config_path: Path) -> list[LocationConfig]:
         json.JSONDecodeError: If config file contains invalid JSON
     """
     logger.info(f"Loading configuration from {config_path}")
-    
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+
+    # Memory-map the file and hand the parser a zero-copy view of it;
+    # an empty file can't be mapped, so fall back to a plain read
+    with open(config_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            data = json_loads(f.read())
+        else:
+            with mm:
+                view = memoryview(mm)
+                try:
+                    data = json_loads(view)
+                finally:
+                    view.release()
     
     locations_data = data.get("locations", [])
     
@@ -0,0 +1,327 @@
+"""Location discovery for BOM Weather Tracker.
+
+This module discovers BOM weather locations by scraping the BOM places
+index page for city links, then loading each city page in a headless
+browser and capturing the location code from the forecast API request
+the page issues. The results are written to a JSON file that can be
+used to build up data/locations.json.
+
+Discovery is driven by asyncio with a bounded semaphore so that many
+city pages can be processed concurrently without overwhelming the BOM
+site or the local machine.
+"""
+
+import asyncio
+import logging
+import re
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+from playwright.async_api import async_playwright
+
+from src.utils import json_dumps, state_name_to_abbrev
+
+logger = logging.getLogger(__name__)
+
+# BOM places index page listing links to every city page
+BOM_BASE_URL = "https://www.bom.gov.au"
+BOM_PLACES_URL = f"{BOM_BASE_URL}/places/"
+
+# Host serving the forecast API the city pages call
+BOM_API_HOST = "api.weather.bom.gov.au"
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 30  # seconds, for the places page fetch
+PAGE_TIMEOUT_MS = 60000  # milliseconds, for browser navigation
+API_WAIT_TIMEOUT = 10.0  # seconds to wait for the forecast API call
+
+# Resources that are never needed to trigger the forecast API call
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+# Anchored to the authority part of the URL (between :// and the first
+# /) so these tokens only match analytics hosts, never a path, bundle
+# name, or query string on a legitimate BOM request
+_BLOCKED_HOSTS_RE = re.compile(
+    r"://[^/]*(?:google-analytics|googletagmanager|doubleclick|segment|hotjar)"
+)
+
+# Matches city page hrefs like /places/new-south-wales/sydney/
+_CITY_HREF_RE = re.compile(r"^/places/([a-z-]+)/([a-z0-9-]+)/?$")
+
+# Matches the location code in forecast API URLs. One alternation covers
+# all the shapes the API uses, tried most-specific first: a geohash
+# (/locations/r1r0fsn/forecasts/...), a numeric pair
+# (/locations/12345/67890/forecasts), and a catch-all. Compiled once:
+# this runs inside the request handler, which fires dozens of times per
+# page load.
+_API_CODE_RE = re.compile(
+    r"/locations/(?:"
+    r"(?P<geohash>[a-z0-9]+)/forecasts"
+    r"|(?P<numeric>\d+/\d+)/forecasts"
+    r"|(?P<any>[^/]+(?:/[^/]+)?)/forecasts"
+    r")"
+)
+
+
+def fetch_places_page(url: str = BOM_PLACES_URL, timeout: int = DEFAULT_TIMEOUT) -> Optional[str]:
+    """Fetch the BOM places index page HTML.
+
+    Uses urllib from the standard library: this is a single page fetch,
+    so a dedicated async HTTP client is not warranted.
+
+    Args:
+        url: URL of the places index page
+        timeout: Request timeout in seconds
+
+    Returns:
+        HTML content as string, or None on failure
+    """
+    try:
+        logger.info(f"Fetching places page: {url}")
+        request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read().decode("utf-8")
+    except Exception as e:
+        logger.error(f"Failed to fetch places page {url}: {e}")
+        return None
+
+
+def parse_city_links(html: str, base_url: str = BOM_BASE_URL) -> list[dict]:
+    """Parse city page links out of the places index HTML.
+
+    Looks for anchors whose href matches /places/{state-name}/{city-slug}/
+    and converts each into a dict with the city name, state abbreviation,
+    and absolute URL. Duplicate URLs are skipped.
+
+    Args:
+        html: HTML content of the places index page
+        base_url: Base URL used to resolve relative hrefs
+
+    Returns:
+        List of dicts with keys: city_name, state, url
+    """
+    # Only anchor tags are needed, so parse just those (with the C-backed
+    # lxml parser) instead of materialising the full DOM.
+    soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer("a", href=True))
+    cities: list[dict] = []
+    seen_urls: set[str] = set()
+
+    for link in soup.find_all("a", href=True):
+        match = _CITY_HREF_RE.match(link["href"])
+        if not match:
+            continue
+
+        state_name, city_slug = match.group(1), match.group(2)
+
+        try:
+            state = state_name_to_abbrev(state_name)
+        except ValueError:
+            # Not a state-level places link (e.g. /places/antarctica/...)
+            continue
+
+        full_url = f"{base_url}{link['href']}"
+        if full_url in seen_urls:
+            continue
+        seen_urls.add(full_url)
+
+        cities.append({
+            "city_name": city_slug.replace("-", " ").title(),
+            "state": state,
+            "url": full_url,
+        })
+
+    logger.info(f"Found {len(cities)} city links on places page")
+    return cities
+
+
+def parse_api_url(api_url: str) -> Optional[str]:
+    """Extract the location code from a BOM forecast API URL.
+
+    The API identifies locations either by geohash
+    (e.g. /locations/r1r0fsn/forecasts/daily) or by a numeric pair
+    (e.g. /locations/12345/67890/forecasts).
+
+    Args:
+        api_url: Full URL of an observed forecast API request
+
+    Returns:
+        Location code string, or None if the URL doesn't match
+    """
+    match = _API_CODE_RE.search(api_url)
+    if match:
+        return match.group("geohash") or match.group("numeric") or match.group("any")
+    return None
+
+
+async def _filter_route(route) -> None:
+    """Abort requests for resources that can't trigger the forecast API.
+
+    City pages pull megabytes of branding images, fonts, and analytics
+    scripts; none of it is needed to make the page issue its forecast
+    API call, so blocking it makes each page load lighter and faster.
+    """
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or _BLOCKED_HOSTS_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def extract_api_code(browser, city_url: str) -> Optional[str]:
+    """Load a city page in a headless browser and capture its API location code.
+
+    The BOM city pages fetch their forecast data from the weather API on
+    page load; intercepting that request is the only reliable way to map
+    a city page to its API location code.
+
+    The browser instance is shared across calls (Chromium cold-start is
+    over a second, dwarfing per-page work); each call only creates a
+    fresh context, which costs tens of milliseconds.
+
+    Args:
+        browser: A running Playwright Browser instance
+        city_url: URL of the city page to load
+
+    Returns:
+        API location code, or None if no forecast API call was observed
+    """
+    api_code: Optional[str] = None
+    code_found = asyncio.Event()
+
+    def handle_request(request) -> None:
+        nonlocal api_code
+        # Bail before any regex work once the code has been captured
+        if api_code is not None or BOM_API_HOST not in request.url:
+            return
+        api_code = parse_api_url(request.url)
+        if api_code is not None:
+            code_found.set()
+
+    try:
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.route("**/*", _filter_route)
+            page.on("request", handle_request)
+
+            # The forecast API call fires within the first second of page
+            # load, so don't wait for "networkidle" (10+ seconds on BOM's
+            # analytics-heavy pages). Return as soon as the navigation has
+            # committed and the API request has been observed.
+            await page.goto(city_url, wait_until="commit", timeout=PAGE_TIMEOUT_MS)
+            try:
+                await asyncio.wait_for(code_found.wait(), timeout=API_WAIT_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.debug(f"No forecast API call within {API_WAIT_TIMEOUT}s for {city_url}")
+        finally:
+            await context.close()
+    except Exception as e:
+        logger.error(f"Failed to extract API code from {city_url}: {e}")
+        return None
+
+    return api_code
+
+
+async def discover_all_locations_async(
+    output_path: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[dict]:
+    """Discover all BOM locations and write them to a JSON file.
+
+    Fetches the places index, then processes every city page concurrently
+    (bounded by a semaphore) to capture each city's API location code.
+
+    Args:
+        output_path: Path to write the discovered locations JSON file
+        concurrency: Maximum number of city pages processed at once
+
+    Returns:
+        List of discovered location dicts
+    """
+    html = await asyncio.to_thread(fetch_places_page)
+    if html is None:
+        return []
+
+    cities = parse_city_links(html)
+    if not cities:
+        logger.warning("No city links found on places page")
+        return []
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with async_playwright() as p:
+        # One browser for the whole run; each city gets its own context
+        browser = await p.chromium.launch(headless=True)
+
+        async def process_city(city: dict) -> Optional[dict]:
+            async with semaphore:
+                logger.info(f"Discovering: {city['city_name']}, {city['state']}")
+                api_code = await extract_api_code(browser, city["url"])
+
+            if api_code is None:
+                logger.warning(f"No API code found for {city['city_name']}")
+                return None
+
+            return {
+                "city_name": city["city_name"],
+                "state": city["state"],
+                "api_code": api_code,
+            }
+
+        try:
+            results = await asyncio.gather(
+                *(process_city(city) for city in cities),
+                return_exceptions=True,
+            )
+        finally:
+            await browser.close()
+
+    locations: list[dict] = []
+    for city, result in zip(cities, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Discovery failed for {city['city_name']}: {result}")
+        elif result is not None:
+            locations.append(result)
+
+    serialize_locations(locations, output_path)
+    logger.info(f"Discovered {len(locations)}/{len(cities)} locations")
+    return locations
+
+
+def discover_all_locations(
+    output_path: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[dict]:
+    """Synchronous entry point for location discovery.
+
+    Args:
+        output_path: Path to write the discovered locations JSON file
+        concurrency: Maximum number of city pages processed at once
+
+    Returns:
+        List of discovered location dicts
+    """
+    return asyncio.run(discover_all_locations_async(output_path, concurrency))
+
+
+def serialize_locations(locations: list[dict], output_path: Path) -> None:
+    """Write discovered locations to a JSON file.
+
+    Args:
+        locations: List of discovered location dicts
+        output_path: Path to write the JSON file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(
+        json_dumps({"locations": locations}),
+        encoding="utf-8",
+    )
+    logger.info(f"Wrote {len(locations)} locations to {output_path}")
+
+
+if __name__ == "__main__":
+    from src.utils import setup_logging
+
+    setup_logging()
+    discover_all_locations(Path("data/discovered_locations.json"))
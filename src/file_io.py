@@ -4,13 +4,34 @@ This module handles reading and writing location forecast data to JSON files,
 with consistent formatting for Git-friendly diffs.
 """
 
+import hashlib
+import logging
+import mmap
+import os
 from pathlib import Path
 from typing import Optional
 
 from src.models import LocationData, serialize_location_data, deserialize_location_data
-from src.utils import setup_logging
+from src.utils import json_dumps_bytes, json_loads
+logger = logging.getLogger(__name__)
 
-logger = setup_logging()
+# Files larger than this are memory-mapped and parsed zero-copy; below
+# it the mmap setup costs more than the byte copy it saves
+_MMAP_THRESHOLD = 64 * 1024
+
+# Directories already created this run. All cities in a state share one
+# directory, so without this every write would re-issue the same mkdir
+# syscall. Set mutation is atomic under the GIL, so worker threads can
+# share it safely.
+_ensured_dirs: set[Path] = set()
+
+
+def _ensure_parent_dir(file_path: Path) -> None:
+    """Create the file's parent directory once per process."""
+    parent = file_path.parent
+    if parent not in _ensured_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(parent)
 
 
 def get_location_file_path(base_dir: Path, state: str, city_name: str) -> Path:
@@ -32,7 +53,9 @@ def get_location_file_path(base_dir: Path, state: str, city_name: str) -> Path:
         >>> get_location_file_path(Path("data"), "NSW", "Sydney")
         PosixPath('data/NSW/Sydney.json')
     """
-    return base_dir / state / f"{city_name}.json"
+    # Join as strings and build one Path: each / on a Path allocates an
+    # intermediate object, and these helpers run per city per operation
+    return Path(os.path.join(os.fspath(base_dir), state, f"{city_name}.json"))
 
 
 def get_archive_file_path(base_dir: Path, state: str, city_name: str) -> Path:
@@ -52,7 +75,7 @@ def get_archive_file_path(base_dir: Path, state: str, city_name: str) -> Path:
         >>> get_archive_file_path(Path("dashboard/public/data"), "NSW", "Sydney")
         PosixPath('dashboard/public/data/archive/NSW/Sydney.json')
     """
-    return base_dir / "archive" / state / f"{city_name}.json"
+    return Path(os.path.join(os.fspath(base_dir), "archive", state, f"{city_name}.json"))
 
 
 def read_location_file(file_path: Path) -> Optional[LocationData]:
@@ -66,94 +89,201 @@ def read_location_file(file_path: Path) -> Optional[LocationData]:
         
     Requirements: 3.1
     """
-    if not file_path.exists():
-        logger.debug(f"Location file does not exist: {file_path}")
-        return None
-    
     try:
-        json_content = file_path.read_text(encoding="utf-8")
-        location_data = deserialize_location_data(json_content)
-        logger.debug(f"Successfully read location file: {file_path}")
+        # No exists() pre-check — letting open() raise saves a stat
+        # syscall on the common path where the file is present.
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+                # Year-scale archives run to megabytes: map them and let
+                # the parser read the page cache directly instead of
+                # copying the whole payload into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        location_data = deserialize_location_data(view)
+                    finally:
+                        view.release()
+            else:
+                location_data = deserialize_location_data(f.read())
+        logger.debug("Successfully read location file: %s", file_path)
         return location_data
+    except FileNotFoundError:
+        logger.debug("Location file does not exist: %s", file_path)
+        return None
     except Exception as e:
         logger.error(f"Failed to read location file {file_path}: {e}")
         return None
 
 
-def merge_archive_data(existing_archive: Optional[LocationData], new_archive: LocationData) -> LocationData:
+def merge_archive_data(existing_archive: Optional[dict], new_archive: dict) -> dict:
     """Merge new archived data with existing archived data.
-    
-    Combines forecast records from both datasets, preserving all historical data.
-    
+
+    Combines forecast records from both datasets, preserving all
+    historical data. Operates on the plain-dict JSON shape rather than
+    LocationData: archives grow without bound, and most records pass
+    through a merge untouched, so materializing (and then discarding)
+    a ForecastRecord/PredictionEntry per historical date is pure
+    overhead. Key ordering is left to the serializer, which sorts keys.
+
+    The archive deliberately stays a single indented JSON document
+    rather than something append-friendly like newline-delimited JSON:
+    the dashboard consumes these files directly and the repo's diffable
+    JSON format is part of the contract. Untouched records still cost a
+    parse/serialize pass, but never dataclass construction.
+
     Args:
-        existing_archive: Existing archived data, or None if no archive exists
-        new_archive: New archived data to merge
-        
+        existing_archive: Existing archived data as a parsed JSON dict,
+            or None if no archive exists
+        new_archive: New archived data to merge, in the same dict shape
+
     Returns:
-        Merged LocationData with all archived forecast records
+        Merged dict with all archived forecast records
     """
     if existing_archive is None:
         return new_archive
-    
-    # Merge forecasts from both archives
-    merged_forecasts = existing_archive.forecasts.copy()
-    
-    for forecast_date_str, forecast_record in new_archive.forecasts.items():
-        if forecast_date_str in merged_forecasts:
+
+    merged_forecasts = existing_archive.get("forecasts", {})
+
+    for forecast_date_str, predictions in new_archive.get("forecasts", {}).items():
+        existing_record = merged_forecasts.get(forecast_date_str)
+        if existing_record is not None:
             # Merge predictions for the same forecast date
-            existing_record = merged_forecasts[forecast_date_str]
-            for days_ahead, prediction in forecast_record.predictions.items():
-                existing_record.predictions[days_ahead] = prediction
-            # Sort predictions by days_ahead
-            existing_record.predictions = dict(sorted(existing_record.predictions.items()))
+            existing_record.update(predictions)
         else:
-            merged_forecasts[forecast_date_str] = forecast_record
-    
-    # Sort forecasts by date
-    existing_archive.forecasts = dict(sorted(merged_forecasts.items()))
-    
+            merged_forecasts[forecast_date_str] = predictions
+
+    existing_archive["forecasts"] = merged_forecasts
+
     return existing_archive
 
 
+def _sidecar_digest_path(file_path: Path) -> Path:
+    """Path of the content-digest sidecar for a location file."""
+    return file_path.with_suffix(file_path.suffix + ".sha")
+
+
+def _content_digest(content: bytes) -> str:
+    """Short content digest used to detect unchanged payloads."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
 def write_location_file(file_path: Path, data: LocationData) -> None:
     """Write location data to JSON file with consistent formatting.
-    
+
     Creates parent directories as needed. Uses 2-space indentation
     for Git-friendly diffs.
-    
+
+    A digest of the serialized content is kept in a sidecar file next to
+    the JSON; when the payload is byte-identical to the previous write
+    (common between collection runs where BOM hasn't re-issued the
+    forecast), the write is skipped entirely, avoiding spurious mtime
+    bumps and Git churn.
+
     Args:
         file_path: Path to write the JSON file
         data: LocationData to serialize and write
-        
+
     Requirements: 3.1, 4.2
     """
+    # Serialize with consistent formatting
+    _write_json_bytes(file_path, serialize_location_data(data))
+
+
+def _existing_digest(file_path: Path, digest_path: Path) -> Optional[str]:
+    """Digest of the current on-disk content, or None if unavailable.
+
+    Prefers the sidecar written by the previous run; when it's missing
+    (fresh checkout, sidecars are gitignored) the existing data file is
+    stream-hashed instead, so the first run after a clone still skips
+    rewriting unchanged files.
+    """
+    try:
+        if file_path.exists():
+            return digest_path.read_text()
+    except FileNotFoundError:
+        pass
+
+    try:
+        with open(file_path, "rb") as f:
+            # hashlib.file_digest is 3.11+; hash in chunks on 3.10
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(
+                    f, lambda: hashlib.blake2b(digest_size=16)
+                ).hexdigest()
+            digest = hashlib.blake2b(digest_size=16)
+            while chunk := f.read(64 * 1024):
+                digest.update(chunk)
+            return digest.hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _write_json_bytes(file_path: Path, content: bytes) -> None:
+    """Write serialized JSON bytes with the digest-sidecar skip logic."""
+    digest = _content_digest(content)
+    digest_path = _sidecar_digest_path(file_path)
+
+    # Skip the write when nothing changed since the last run
+    if _existing_digest(file_path, digest_path) == digest:
+        # Refresh the sidecar if the match came from hashing the file
+        # itself, so subsequent runs get the cheap comparison
+        if not digest_path.exists():
+            _write_digest_sidecar(digest_path, digest)
+        logger.debug("Skipping unchanged location file: %s", file_path)
+        return
+
     # Create parent directories if they don't exist
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Serialize and write with consistent formatting
-    json_content = serialize_location_data(data)
-    file_path.write_text(json_content, encoding="utf-8")
-    
-    logger.debug(f"Successfully wrote location file: {file_path}")
+    _ensure_parent_dir(file_path)
+
+    # Write to a sibling temp file and rename into place: os.replace is
+    # atomic, so a crash mid-write can never leave a truncated JSON file
+    # for the next run to choke on. Deliberately no fsync — page-cache
+    # durability is fine for a re-fetchable forecast cache, and fsync
+    # per city would dominate the write path.
+    data_tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    data_tmp_path.write_bytes(content)
+    os.replace(data_tmp_path, file_path)
+
+    _write_digest_sidecar(digest_path, digest)
+
+    logger.debug("Successfully wrote location file: %s", file_path)
+
+
+def _write_digest_sidecar(digest_path: Path, digest: str) -> None:
+    """Atomically record the digest so a crash can't leave a stale one."""
+    tmp_path = digest_path.with_suffix(digest_path.suffix + ".tmp")
+    tmp_path.write_text(digest)
+    os.replace(tmp_path, digest_path)
 
 
 def write_archive_file(file_path: Path, data: LocationData) -> None:
     """Write archived location data to JSON file.
-    
+
     Reads existing archive data, merges with new data, and writes back.
+    The existing archive is read and merged as a plain JSON dict so the
+    (potentially large) historical records are never materialized into
+    dataclasses only to be serialized straight back out.
     Creates parent directories as needed.
-    
+
     Args:
         file_path: Path to write the archived JSON file
         data: LocationData to archive
     """
     # Read existing archive data if it exists
-    existing_archive = read_location_file(file_path)
-    
+    existing_archive: Optional[dict] = None
+    try:
+        parsed = json_loads(file_path.read_bytes())
+        if isinstance(parsed, dict):
+            existing_archive = parsed
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Failed to read archive file {file_path}: {e}")
+
     # Merge with existing archive data
-    merged_archive = merge_archive_data(existing_archive, data)
-    
+    merged_archive = merge_archive_data(existing_archive, data.to_dict())
+
     # Write merged archive data
-    write_location_file(file_path, merged_archive)
-    
-    logger.debug(f"Successfully wrote archive file: {file_path}")
+    _write_json_bytes(file_path, json_dumps_bytes(merged_archive))
+
+    logger.debug("Successfully wrote archive file: %s", file_path)
@@ -4,7 +4,10 @@ This module handles merging new forecast data with existing location data
 and applying retention policies to remove old forecast records.
 """
 
-from datetime import date
+import logging
+from bisect import bisect_left
+from dataclasses import fields
+from datetime import date, timedelta
 from typing import Optional
 from pathlib import Path
 
@@ -14,9 +17,11 @@ from src.models import (
     LocationData,
 )
 from src.xml_parser import ParsedForecast
-from src.utils import setup_logging
+logger = logging.getLogger(__name__)
 
-logger = setup_logging()
+# Field names in declaration order, resolved once so the merge loop can
+# build merged entries positionally instead of six keyword lookups
+_PREDICTION_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(PredictionEntry))
 
 
 def _merge_prediction_entry(
@@ -24,28 +29,29 @@ def _merge_prediction_entry(
     new: PredictionEntry,
 ) -> PredictionEntry:
     """Merge a new prediction entry with an existing one.
-    
-    Preserves existing non-null values when the new entry has null/empty values.
-    New non-null values will overwrite existing values.
-    
+
+    Preserves existing non-null values when the new entry has null
+    values; new non-null values overwrite. When both entries exist the
+    existing one is updated in place and returned — the caller owns it
+    exclusively, and skipping the dataclass construction matters in
+    this per-day, per-city loop. The check is uniformly `is not None`
+    for every field.
+
     Args:
-        existing: Existing prediction entry, or None
+        existing: Existing prediction entry (mutated in place), or None
         new: New prediction entry from current collection
-        
+
     Returns:
         Merged PredictionEntry with preserved values
     """
     if existing is None:
         return new
-    
-    return PredictionEntry(
-        icon_code=new.icon_code if new.icon_code is not None else existing.icon_code,
-        temp_min=new.temp_min if new.temp_min is not None else existing.temp_min,
-        temp_max=new.temp_max if new.temp_max is not None else existing.temp_max,
-        precipitation_prob=new.precipitation_prob if new.precipitation_prob else existing.precipitation_prob,
-        precis=new.precis if new.precis else existing.precis,
-        forecast=new.forecast if new.forecast else existing.forecast,
-    )
+
+    for field_name in _PREDICTION_FIELDS:
+        value = getattr(new, field_name)
+        if value is not None:
+            setattr(existing, field_name, value)
+    return existing
 
 
 def merge_forecast(
@@ -81,13 +87,21 @@ def merge_forecast(
             forecasts={},
         )
     
+    # Track whether this merge introduced keys that break the sorted
+    # order carried over from the previous run, so the dict rebuilds
+    # below only happen when something actually changed position.
+    # Records that gained a days_ahead key are collected and re-sorted
+    # once after the loop rather than per insertion.
+    inserted_new_date = False
+    records_to_sort: dict[str, ForecastRecord] = {}
+
     # Process each forecast day from the new forecast
     for forecast_day in new_forecast.forecasts:
         forecast_date_str = forecast_day.forecast_date.isoformat()
-        
+
         # Calculate days_ahead as (forecast_date - collection_date).days
         days_ahead = (forecast_day.forecast_date - collection_date).days
-        
+
         # Create prediction entry from forecast day
         new_prediction = PredictionEntry(
             icon_code=forecast_day.icon_code,
@@ -97,34 +111,42 @@ def merge_forecast(
             precis=forecast_day.precis,
             forecast=forecast_day.forecast,
         )
-        
+
         # Get or create forecast record for this forecast date
-        if forecast_date_str in existing.forecasts:
-            forecast_record = existing.forecasts[forecast_date_str]
-        else:
+        forecast_record = existing.forecasts.get(forecast_date_str)
+        if forecast_record is None:
             forecast_record = ForecastRecord(
                 forecast_date=forecast_day.forecast_date,
                 predictions={},
             )
             existing.forecasts[forecast_date_str] = forecast_record
-        
+            inserted_new_date = True
+
         # Merge with existing prediction if present, preserving non-null values
         existing_prediction = forecast_record.predictions.get(days_ahead)
+        if existing_prediction is None and forecast_record.predictions:
+            records_to_sort[forecast_date_str] = forecast_record
         forecast_record.predictions[days_ahead] = _merge_prediction_entry(
             existing_prediction, new_prediction
         )
-        
-        # Sort predictions by days_ahead to maintain consistent order
+
+    # One terminal sort per record that gained a days_ahead key; updates
+    # to existing keys keep their position and cost nothing here
+    for forecast_record in records_to_sort.values():
         forecast_record.predictions = dict(
             sorted(forecast_record.predictions.items())
         )
+
+    # Forecasts from the previous run are already sorted; re-sort only
+    # when this merge added a forecast date
+    if inserted_new_date:
+        existing.forecasts = dict(sorted(existing.forecasts.items()))
     
-    # Sort forecasts by date for consistent output
-    existing.forecasts = dict(sorted(existing.forecasts.items()))
-    
+    # Lazy %-style formatting: at the production INFO level these
+    # per-merge messages are never built
     logger.debug(
-        f"Merged {len(new_forecast.forecasts)} forecast days for "
-        f"{new_forecast.city_name} (collection date: {collection_date})"
+        "Merged %d forecast days for %s (collection date: %s)",
+        len(new_forecast.forecasts), new_forecast.city_name, collection_date,
     )
     
     return existing
@@ -159,35 +181,35 @@ def archive_old_records(
         aedt_tz = ZoneInfo("Australia/Sydney")
         reference_date = datetime.now(aedt_tz).date()
     
-    # Separate current and archived forecast records
-    current_forecasts: dict[str, ForecastRecord] = {}
-    archived_forecasts: dict[str, ForecastRecord] = {}
-    
-    for forecast_date_str, forecast_record in data.forecasts.items():
-        if forecast_record.forecast_date >= reference_date:
-            current_forecasts[forecast_date_str] = forecast_record
-        else:
-            archived_forecasts[forecast_date_str] = forecast_record
-    
+    # The forecasts dict is kept sorted by its ISO-date keys, so the
+    # current/archived boundary is a bisect on the key list rather than
+    # a date comparison per record
+    forecasts = data.forecasts
+    keys = list(forecasts)
+    split = bisect_left(keys, reference_date.isoformat())
+
+    if split == 0:
+        # Nothing to archive; leave the dict untouched
+        return data, None
+
+    archived_forecasts = {key: forecasts[key] for key in keys[:split]}
+
     # Update current data
-    data.forecasts = current_forecasts
-    
-    # Create archived data if there are records to archive
-    archived_data = None
-    if archived_forecasts:
-        archived_data = LocationData(
-            product_id=data.product_id,
-            city_name=data.city_name,
-            state=data.state,
-            timezone=data.timezone,
-            forecasts=archived_forecasts,
-        )
-        
-        logger.debug(
-            f"Archived {len(archived_forecasts)} forecast records "
-            f"older than {reference_date} for {data.city_name}"
-        )
+    data.forecasts = {key: forecasts[key] for key in keys[split:]}
     
+    archived_data = LocationData(
+        product_id=data.product_id,
+        city_name=data.city_name,
+        state=data.state,
+        timezone=data.timezone,
+        forecasts=archived_forecasts,
+    )
+
+    logger.debug(
+        "Archived %d forecast records older than %s for %s",
+        len(archived_forecasts), reference_date, data.city_name,
+    )
+
     return data, archived_data
 
 
@@ -221,23 +243,23 @@ def apply_retention(
         reference_date = datetime.now(aedt_tz).date()
     
     # Calculate cutoff date
-    cutoff_date = date.fromordinal(reference_date.toordinal() - retention_days)
-    
-    # Filter out old forecast records
-    retained_forecasts: dict[str, ForecastRecord] = {}
-    removed_count = 0
-    
-    for forecast_date_str, forecast_record in data.forecasts.items():
-        if forecast_record.forecast_date >= cutoff_date:
-            retained_forecasts[forecast_date_str] = forecast_record
-        else:
-            removed_count += 1
-    
-    if removed_count > 0:
-        logger.debug(
-            f"Retention policy removed {removed_count} forecast records "
-            f"older than {cutoff_date} for {data.city_name}"
-        )
-    
-    data.forecasts = retained_forecasts
+    cutoff_date = reference_date - timedelta(days=retention_days)
+
+    # The merger keeps forecasts sorted by their ISO-date keys, which
+    # order lexically the same as chronologically, so the cutoff point
+    # can be bisected instead of comparing every record
+    keys = list(data.forecasts)
+    removed_count = bisect_left(keys, cutoff_date.isoformat())
+
+    if removed_count == 0:
+        return data
+
+    forecasts = data.forecasts
+    data.forecasts = {key: forecasts[key] for key in keys[removed_count:]}
+
+    logger.debug(
+        "Retention policy removed %d forecast records older than %s for %s",
+        removed_count, cutoff_date, data.city_name,
+    )
+
     return data
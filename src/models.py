@@ -4,13 +4,22 @@ This module defines the core data structures for storing location
 configuration and forecast data, along with JSON serialization functions.
 """
 
+import json
+import os
 from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
 from typing import Any, Optional
-import json
 
+from src.utils import json_dumps_bytes, json_loads, orjson_available
+
+# The same forecast dates recur as keys across every location file and
+# archive record loaded in a process, so memoize the ISO parse; dates
+# are immutable, making the shared cache safe
+_parse_iso_date = lru_cache(maxsize=4096)(date.fromisoformat)
 
-@dataclass
+
+@dataclass(slots=True)
 class PredictionEntry:
     """Represents a single prediction for a specific forecast date.
     
@@ -30,14 +39,18 @@ class PredictionEntry:
     forecast: Optional[str] = None
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+        """Convert to dictionary for JSON serialization.
+
+        Keys are emitted in alphabetical order so serializers can write
+        insertion order directly instead of re-sorting every object.
+        """
         return {
+            "forecast": self.forecast,
             "icon_code": self.icon_code,
-            "temp_min": self.temp_min,
-            "temp_max": self.temp_max,
             "precipitation_prob": self.precipitation_prob,
             "precis": self.precis,
-            "forecast": self.forecast,
+            "temp_max": self.temp_max,
+            "temp_min": self.temp_min,
         }
 
     @classmethod
@@ -53,7 +66,7 @@ class PredictionEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ForecastRecord:
     """Represents all predictions for a specific forecast date.
     
@@ -61,6 +74,14 @@ class ForecastRecord:
         forecast_date: The date this forecast is for
         predictions: Dictionary of prediction entries keyed by days_ahead (int as string for JSON)
     """
+    # Kept as a dict rather than a fixed 8-slot list: days_ahead is
+    # usually 0-7 but not guaranteed — a backfill run dated after the
+    # forecast date produces negative values, and files on disk must
+    # round-trip whatever keys they already hold.
+    # No cached isoformat of forecast_date here: the consumers that key
+    # dicts by the ISO string (merger, archive merge) all hoist their
+    # own local, so a per-record cached copy would be computed on every
+    # file load and never read.
     forecast_date: date
     predictions: dict[int, PredictionEntry] = field(default_factory=dict)
 
@@ -82,7 +103,7 @@ class ForecastRecord:
             forecast_date_str: The forecast date as ISO string
             data: Dictionary with string keys (days_ahead) mapping to prediction data
         """
-        forecast_date = date.fromisoformat(forecast_date_str)
+        forecast_date = _parse_iso_date(forecast_date_str)
         predictions = {
             int(days_ahead): PredictionEntry.from_dict(entry_data)
             for days_ahead, entry_data in data.items()
@@ -90,7 +111,7 @@ class ForecastRecord:
         return cls(forecast_date=forecast_date, predictions=predictions)
 
 
-@dataclass
+@dataclass(slots=True)
 class LocationData:
     """Complete forecast data for a location, as stored in JSON files.
     
@@ -108,16 +129,20 @@ class LocationData:
     forecasts: dict[str, ForecastRecord] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+        """Convert to dictionary for JSON serialization.
+
+        Keys are emitted in alphabetical order so serializers can write
+        insertion order directly instead of re-sorting every object.
+        """
         return {
-            "product_id": self.product_id,
             "city_name": self.city_name,
-            "state": self.state,
-            "timezone": self.timezone,
             "forecasts": {
                 forecast_date: record.to_dict()
                 for forecast_date, record in self.forecasts.items()
             },
+            "product_id": self.product_id,
+            "state": self.state,
+            "timezone": self.timezone,
         }
 
     @classmethod
@@ -138,26 +163,92 @@ class LocationData:
 
 # JSON Serialization/Deserialization Functions
 
-def serialize_location_data(data: LocationData) -> str:
-    """Serialize LocationData to JSON string with consistent formatting.
-    
+def _location_payload(data: LocationData) -> dict[str, Any]:
+    """Build the JSON payload for a LocationData in one pass.
+
+    Equivalent to data.to_dict(), but inlines the per-record and
+    per-entry to_dict calls into a single comprehension chain — the
+    method hops cost a Python frame per prediction, which adds up when
+    serializing every city each run. The to_dict methods remain the
+    public conversion API; keep the two in sync.
+
+    Keys are written in alphabetical order (and the merger keeps
+    forecasts and predictions sorted), so the serializer can emit
+    insertion order directly — no per-object sort_keys pass.
+    """
+    return {
+        "city_name": data.city_name,
+        "forecasts": {
+            forecast_date: {
+                str(days_ahead): {
+                    "forecast": entry.forecast,
+                    "icon_code": entry.icon_code,
+                    "precipitation_prob": entry.precipitation_prob,
+                    "precis": entry.precis,
+                    "temp_max": entry.temp_max,
+                    "temp_min": entry.temp_min,
+                }
+                for days_ahead, entry in record.predictions.items()
+            }
+            for forecast_date, record in data.forecasts.items()
+        },
+        "product_id": data.product_id,
+        "state": data.state,
+        "timezone": data.timezone,
+    }
+
+
+def serialize_location_data(data: LocationData) -> bytes:
+    """Serialize LocationData to JSON bytes with consistent formatting.
+
+    Bytes are returned (rather than a string) so writers can hand them
+    straight to write_bytes without a second full-buffer UTF-8 encode.
+
     Args:
         data: The location data to serialize
-        
+
     Returns:
-        JSON string with 2-space indentation for Git-friendly diffs
+        UTF-8 JSON bytes with 2-space indentation for Git-friendly diffs
     """
-    return json.dumps(data.to_dict(), indent=2, sort_keys=True)
+    # The payload is already in sorted key order (alphabetical field
+    # names, merger-sorted dates and days_ahead), so skip the
+    # serializer's redundant per-object key sort
+    return json_dumps_bytes(_location_payload(data), sort_keys=False)
 
 
-def deserialize_location_data(json_str: str) -> LocationData:
-    """Deserialize JSON string to LocationData.
-    
+def serialize_location_data_to_file(data: LocationData, path: "str | os.PathLike[str]") -> None:
+    """Serialize LocationData straight to a file.
+
+    With orjson installed this is one encode plus one write; under the
+    stdlib fallback json.dump streams into the file object, so the full
+    document is never held as a Python string. Useful for exporting
+    very large payloads. The collector's write path deliberately does
+    not use this — file_io.write_location_file needs the serialized
+    bytes in hand to compute the change-detection digest and to rename
+    a temp file into place atomically.
+
     Args:
-        json_str: JSON string to parse
-        
+        data: The location data to serialize
+        path: Destination file path
+    """
+    if orjson_available():
+        with open(path, "wb") as f:
+            f.write(serialize_location_data(data))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(_location_payload(data), f, indent=2)
+
+
+def deserialize_location_data(json_str: bytes | str | memoryview) -> LocationData:
+    """Deserialize JSON to LocationData.
+
+    Args:
+        json_str: JSON document to parse; bytes (or a memoryview over a
+            memory-mapped file) are preferred — orjson parses them
+            directly without a separate UTF-8 decode
+
     Returns:
         LocationData instance with all fields intact
     """
-    data = json.loads(json_str)
+    data = json_loads(json_str)
     return LocationData.from_dict(data)
@@ -4,38 +4,122 @@ This module provides shared utilities including logging setup,
 path generation, and retry logic for network requests.
 """
 
+import json
 import logging
 import os
 import time
-from functools import wraps
-from typing import Callable, TypeVar, ParamSpec
+from functools import lru_cache, wraps
+from typing import Any, Callable, TypeVar, ParamSpec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json module
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
+
+def orjson_available() -> bool:
+    """Whether the optional orjson dependency is importable."""
+    return orjson is not None
+
+
+def json_loads(data: bytes | str | memoryview) -> Any:
+    """Parse JSON using orjson when available, else stdlib json.
+
+    orjson parses several times faster than the stdlib and accepts raw
+    bytes or a memoryview directly (skipping a separate UTF-8 decode
+    pass, and allowing zero-copy parsing from a memory-mapped file).
+    Invalid JSON raises json.JSONDecodeError either way (orjson's
+    JSONDecodeError is a subclass of it).
+
+    Args:
+        data: JSON document as bytes, string, or memoryview
+
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, sort_keys: bool = True) -> str:
+    """Serialize to an indented JSON string using orjson when available.
+
+    Output uses 2-space indentation for Git-friendly diffs, matching the
+    formatting used throughout the data files.
+
+    Args:
+        obj: Object to serialize
+        sort_keys: Whether to sort object keys in the output
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2, sort_keys=sort_keys)
+
+
+def json_dumps_bytes(obj: Any, sort_keys: bool = True) -> bytes:
+    """Serialize to indented JSON bytes using orjson when available.
+
+    Same formatting as json_dumps, but returns the UTF-8 bytes directly.
+    orjson produces bytes natively, so callers that write to disk skip
+    the str round trip (a decode here plus an encode at the write).
+
+    Args:
+        obj: Object to serialize
+        sort_keys: Whether to sort object keys in the output
+
+    Returns:
+        JSON document as UTF-8 bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2, sort_keys=sort_keys).encode("utf-8")
+
 
 def setup_logging(name: str = "bom_weather_tracker") -> logging.Logger:
     """Configure logging with timestamp and context.
-    
+
+    Installs the shared handler and formatter on the root logger, so
+    per-module loggers created with logging.getLogger(__name__) all
+    propagate to it. Intended to be called once from an entry point;
+    repeat calls are no-ops so imports stay cheap and log lines are
+    never duplicated across handlers.
+
     Args:
         name: Logger name
-        
+
     Returns:
         Configured logger instance
     """
-    logger = logging.getLogger(name)
-    
-    if not logger.handlers:
+    root = logging.getLogger()
+
+    if not root.handlers:
         handler = logging.StreamHandler()
         formatter = logging.Formatter(
             "[%(asctime)s] [%(levelname)s] %(message)s",
             datefmt="%Y-%m-%dT%H:%M:%SZ"
         )
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-    
-    return logger
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+
+    return logging.getLogger(name)
 
 
 def get_data_filepath(state: str, city: str, base_dir: str = "data") -> str:
@@ -49,7 +133,10 @@ def get_data_filepath(state: str, city: str, base_dir: str = "data") -> str:
     Returns:
         Path in format data/{state}/{city}.json
     """
-    return os.path.join(base_dir, state, f"{city}.json")
+    # Forward slashes on purpose: these paths name Git-tracked JSON
+    # artifacts, and the f-string skips os.path.join's per-segment
+    # type checks and separator handling on this per-city call
+    return f"{base_dir}/{state}/{city}.json"
 
 
 def retry_request(
@@ -72,12 +159,14 @@ def retry_request(
         Decorated function with retry logic
     """
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        # The delay schedule is fixed by the decorator arguments, so
+        # compute it once here instead of multiplying per attempt
+        delays = tuple(delay * (backoff ** i) for i in range(max_retries - 1))
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            logger = setup_logging()
             last_exception = None
-            current_delay = delay
-            
+
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
@@ -85,32 +174,42 @@ def retry_request(
                     last_exception = e
                     if attempt < max_retries - 1:
                         logger.warning(
-                            f"Attempt {attempt + 1}/{max_retries} failed: {e}. "
-                            f"Retrying in {current_delay:.1f}s..."
+                            "Attempt %d/%d failed: %s. Retrying in %.1fs...",
+                            attempt + 1, max_retries, e, delays[attempt],
                         )
-                        time.sleep(current_delay)
-                        current_delay *= backoff
+                        time.sleep(delays[attempt])
                     else:
                         logger.error(
                             f"All {max_retries} attempts failed for {func.__name__}: {e}"
                         )
-            
+
             raise last_exception  # type: ignore
-        
+
         return wrapper
-    
+
     return decorator
 
 
+# Directories already created this process; mirrors the cache in
+# file_io so repeated writes into the same state directory cost a set
+# lookup instead of a makedirs syscall. Never invalidated — nothing in
+# this codebase removes data directories mid-run.
+_ensured_dirs: set[str] = set()
+
+
 def ensure_directory_exists(filepath: str) -> None:
     """Ensure the directory for a filepath exists.
-    
+
+    Creation is cached for the life of the process, so only the first
+    file in a directory pays the makedirs syscall.
+
     Args:
         filepath: Path to a file (directory will be created if needed)
     """
     directory = os.path.dirname(filepath)
-    if directory:
+    if directory and directory not in _ensured_dirs:
         os.makedirs(directory, exist_ok=True)
+        _ensured_dirs.add(directory)
 
 
 # Mapping of URL state names to standard Australian state/territory abbreviations
@@ -125,9 +224,16 @@ STATE_ABBREVIATIONS: dict[str, str] = {
     "australian-capital-territory": "ACT",
 }
 
+# Joined once for error messages rather than per unknown name
+_VALID_STATE_NAMES = ", ".join(sorted(STATE_ABBREVIATIONS))
 
+
+@lru_cache(maxsize=16)
 def state_name_to_abbrev(state_name: str) -> str:
     """Convert URL state name to standard abbreviation.
+
+    Memoized: a crawl calls this once per discovered URL but with only
+    the eight state names, so repeats collapse to a cache hit.
     
     Converts state names as they appear in BOM URLs (e.g., "new-south-wales")
     to standard Australian state/territory abbreviations (e.g., "NSW").
@@ -147,13 +253,17 @@ def state_name_to_abbrev(state_name: str) -> str:
         >>> state_name_to_abbrev("victoria")
         'VIC'
     """
-    normalized = state_name.lower().strip()
-    
-    if normalized not in STATE_ABBREVIATIONS:
-        valid_states = ", ".join(sorted(STATE_ABBREVIATIONS.keys()))
+    # BOM URLs already carry the lowercase hyphenated form, so try the
+    # raw input first and only pay the lower/strip allocations on a miss
+    abbrev = STATE_ABBREVIATIONS.get(state_name)
+    if abbrev is not None:
+        return abbrev
+
+    abbrev = STATE_ABBREVIATIONS.get(state_name.lower().strip())
+    if abbrev is None:
         raise ValueError(
             f"Unknown state name: '{state_name}'. "
-            f"Valid state names are: {valid_states}"
+            f"Valid state names are: {_VALID_STATE_NAMES}"
         )
-    
-    return STATE_ABBREVIATIONS[normalized]
+
+    return abbrev
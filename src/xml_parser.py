@@ -4,18 +4,107 @@ This module handles parsing BOM forecast XML files and extracting
 structured forecast data.
 """
 
+import hashlib
+import io
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from datetime import date, datetime
-from typing import Optional
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from typing import Iterable, Optional
 import xml.etree.ElementTree as ET
 import logging
 
-from src.utils import setup_logging
+try:
+    from lxml import etree as _lxml_etree
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False  # Fall back to the stdlib parser
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
 
+# Exceptions that signal malformed XML, for whichever backend is active
+if HAVE_LXML:
+    _XML_PARSE_ERRORS: tuple[type[Exception], ...] = (ET.ParseError, _lxml_etree.XMLSyntaxError)
+    # One parser instance reused across documents: entity resolution is
+    # off (BOM feeds never use entities, and this defuses entity-
+    # expansion attacks for free) and huge_tree stays off so a
+    # corrupted download can't balloon memory
+    _LXML_PARSER = _lxml_etree.XMLParser(resolve_entities=False, huge_tree=False)
+    # XPath expressions compiled once at import; calling an etree.XPath
+    # object skips the per-call path parse that find/findall and the
+    # string xpath() form pay
+    _XP_FORECAST_AREAS = _lxml_etree.XPath(
+        "./area[@type='location' or @type='metropolitan']"
+    )
+    _XP_FORECAST_PERIODS = _lxml_etree.XPath("./forecast-period")
+else:
+    _XML_PARSE_ERRORS = (ET.ParseError,)
+    _LXML_PARSER = None
+    _XP_FORECAST_AREAS = None
+    _XP_FORECAST_PERIODS = None
+
+
+# UTC-offset objects keyed by the "+HH:MM"/"-HH:MM" suffix; Australia
+# has a handful of offsets, so every issue time after the first few
+# reuses a cached timezone instead of constructing one
+_TZ_CACHE: dict[str, dt_timezone] = {}
+
+
+def _fast_parse_bom_datetime(s: str) -> datetime:
+    """Parse a BOM local timestamp of the fixed shape
+    YYYY-MM-DDTHH:MM:SS±HH:MM.
+
+    Slicing out the six fields and the offset directly skips
+    fromisoformat's general-format handling; anything that doesn't fit
+    the shape falls back to fromisoformat, so this accepts exactly what
+    the generic parser accepts.
+
+    Args:
+        s: Timestamp string as found in issue-time-local
 
-@dataclass
+    Returns:
+        Timezone-aware datetime
+
+    Raises:
+        ValueError: If the timestamp is invalid in either parser
+    """
+    try:
+        offset_str = s[19:]
+        tz = _TZ_CACHE.get(offset_str)
+        if tz is None:
+            sign = offset_str[0]
+            if sign not in "+-" or offset_str[3] != ":" or len(offset_str) != 6:
+                raise ValueError(f"unexpected offset: {offset_str!r}")
+            minutes = int(offset_str[1:3]) * 60 + int(offset_str[4:6])
+            if sign == "-":
+                minutes = -minutes
+            tz = dt_timezone(timedelta(minutes=minutes))
+            _TZ_CACHE[offset_str] = tz
+        return datetime(
+            int(s[0:4]), int(s[5:7]), int(s[8:10]),
+            int(s[11:13]), int(s[14:16]), int(s[17:19]),
+            tzinfo=tz,
+        )
+    except (IndexError, ValueError):
+        return datetime.fromisoformat(s)
+
+
+@lru_cache(maxsize=512)
+def _parse_start_date(start_time_str: str) -> date:
+    """Date portion of a start-time-local attribute, memoized.
+
+    Capital-city feeds repeat the same timestamps across the location
+    and metropolitan areas, so identical strings hit the cache instead
+    of re-running the full ISO-8601 parse. Raises ValueError on
+    malformed input, same as datetime.fromisoformat.
+    """
+    return datetime.fromisoformat(start_time_str).date()
+
+
+@dataclass(slots=True)
 class ForecastDay:
     """Represents a single day's forecast data extracted from BOM XML.
     
@@ -37,7 +126,7 @@ class ForecastDay:
     forecast: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedForecast:
     """Represents a complete parsed BOM forecast XML.
     
@@ -56,6 +145,47 @@ class ParsedForecast:
 
 
 
+# Schema tokens compared against parser output in the hot loops,
+# interned so equality checks and dict probes can take CPython's
+# pointer-identity fast path when the parser's own string cache hands
+# back the same objects. Hyphenated names matter most — the compiler
+# only auto-interns identifier-like literals.
+_T_ELEMENT = sys.intern("element")
+_T_TEXT = sys.intern("text")
+_T_AREA = sys.intern("area")
+_T_FORECAST_PERIOD = sys.intern("forecast-period")
+_T_IDENTIFIER = sys.intern("identifier")
+_T_ISSUE_TIME_LOCAL = sys.intern("issue-time-local")
+_T_LOCATION = sys.intern("location")
+_T_METROPOLITAN = sys.intern("metropolitan")
+_T_FORECAST = sys.intern("forecast")
+
+# Schema type attribute -> ForecastDay field, for the two child kinds
+# of a forecast-period. A dict probe replaces the up-to-three string
+# comparisons per child of the previous if/elif chains, and unknown
+# types fall out as a None lookup. <element> values are integers;
+# <text> values are stripped strings.
+_ELEMENT_FIELDS = {
+    sys.intern("forecast_icon_code"): "icon_code",
+    sys.intern("air_temperature_minimum"): "temp_min",
+    sys.intern("air_temperature_maximum"): "temp_max",
+}
+_TEXT_FIELDS = {
+    sys.intern("probability_of_precipitation"): "precipitation_prob",
+    sys.intern("precis"): "precis",
+    sys.intern("forecast"): "forecast",
+}
+
+
+def _maybe_strip(s: str) -> str:
+    """Strip only when needed; BOM text content is almost always clean,
+    so the common case returns the parser's string without allocating
+    a trimmed copy."""
+    if s and (s[0].isspace() or s[-1].isspace()):
+        return s.strip()
+    return s
+
+
 def _parse_forecast_period(period_elem: ET.Element) -> Optional[ForecastDay]:
     """Parse a single forecast-period element.
     
@@ -74,82 +204,117 @@ def _parse_forecast_period(period_elem: ET.Element) -> Optional[ForecastDay]:
     try:
         # Parse the datetime and extract just the date
         # Format: 2025-12-21T00:00:00+09:30
-        forecast_date = datetime.fromisoformat(start_time_str).date()
+        forecast_date = _parse_start_date(start_time_str)
     except ValueError as e:
         logger.warning(f"Invalid date format in forecast period: {start_time_str} - {e}")
         return None
     
-    # Extract element values (icon_code, temp_min, temp_max)
-    icon_code: Optional[int] = None
-    temp_min: Optional[int] = None
-    temp_max: Optional[int] = None
-    
-    for elem in period_elem.findall("element"):
-        elem_type = elem.get("type")
-        elem_text = elem.text
-        
-        if elem_type == "forecast_icon_code" and elem_text:
-            try:
-                icon_code = int(elem_text)
-            except ValueError:
-                logger.warning(f"Invalid icon_code value: {elem_text}")
-        elif elem_type == "air_temperature_minimum" and elem_text:
-            try:
-                temp_min = int(elem_text)
-            except ValueError:
-                logger.warning(f"Invalid temp_min value: {elem_text}")
-        elif elem_type == "air_temperature_maximum" and elem_text:
-            try:
-                temp_max = int(elem_text)
-            except ValueError:
-                logger.warning(f"Invalid temp_max value: {elem_text}")
-    
-    # Extract text values (precipitation_prob, precis, forecast)
-    precipitation_prob: Optional[str] = None
-    precis: Optional[str] = None
-    forecast: Optional[str] = None
-    
-    for text_elem in period_elem.findall("text"):
-        text_type = text_elem.get("type")
-        text_content = text_elem.text
-        
-        if text_type == "probability_of_precipitation" and text_content:
-            precipitation_prob = text_content.strip()
-        elif text_type == "precis" and text_content:
-            precis = text_content.strip()
-        elif text_type == "forecast" and text_content:
-            forecast = text_content.strip()
+    # Extract element values (icon_code, temp_min, temp_max) and text
+    # values (precipitation_prob, precis, forecast) in one pass over the
+    # children, dispatching each type attribute through the module-level
+    # field tables
+    values: dict[str, "int | str"] = {}
+
+    for child in period_elem:
+        tag = child.tag
+        if tag == _T_ELEMENT:
+            field = _ELEMENT_FIELDS.get(child.get("type"))
+            elem_text = child.text
+            if field and elem_text:
+                try:
+                    values[field] = int(elem_text)
+                except ValueError:
+                    logger.warning(f"Invalid {field} value: {elem_text}")
+        elif tag == _T_TEXT:
+            field = _TEXT_FIELDS.get(child.get("type"))
+            text_content = child.text
+            if field and text_content:
+                values[field] = _maybe_strip(text_content)
     
+    # Positional construction in field-declaration order: with slots
+    # this is the cheapest dataclass instantiation path, skipping the
+    # kwargs dict and keyword matching that **values would cost
+    get = values.get
     return ForecastDay(
-        forecast_date=forecast_date,
-        icon_code=icon_code,
-        temp_min=temp_min,
-        temp_max=temp_max,
-        precipitation_prob=precipitation_prob,
-        precis=precis,
-        forecast=forecast
+        forecast_date,
+        get("icon_code"),
+        get("temp_min"),
+        get("temp_max"),
+        get("precipitation_prob"),
+        get("precis"),
+        get("forecast"),
     )
 
 
-def parse_forecast_xml(xml_content: str) -> Optional[ParsedForecast]:
+# Successfully parsed documents keyed by a short content digest, so
+# re-parsing identical bytes (a product BOM hasn't re-issued, or a
+# retried fetch) is a dict hit. LRU-bounded; hashing is ~100x cheaper
+# than parsing, so misses cost little.
+_PARSE_CACHE: OrderedDict[bytes, ParsedForecast] = OrderedDict()
+_PARSE_CACHE_SIZE = 32
+
+# Documents at least this large go through the streaming parser, which
+# bounds live nodes to one forecast-period instead of materializing a
+# tree a couple of times the document size. City feeds sit well under
+# this; combined state feeds are the ones that blow past it.
+_STREAM_THRESHOLD = 256 * 1024
+
+
+def parse_forecast_xml(xml_content: bytes | str) -> Optional[ParsedForecast]:
     """Parse BOM forecast XML and extract structured forecast data.
-    
+
     Extracts the location area with type="location", parses all forecast
     periods, and extracts the issue time and timezone from the amoc section.
-    
+
     For capital cities, the XML has separate "metropolitan" and "location" areas.
     The metropolitan area contains the detailed forecast text, while the location
     area contains icon codes, temperatures, and precis. This function merges both.
-    
+
+    Results for byte input are cached by content digest, and a repeat
+    parse of identical bytes returns the same ParsedForecast object —
+    callers should treat the result as read-only (the collector does).
+
     Args:
-        xml_content: Raw XML content as string
-        
+        xml_content: Raw XML content as bytes (preferred; the parser
+            handles the document's declared encoding natively) or string
+
     Returns:
         ParsedForecast if parsing succeeds, None on failure
     """
+    if isinstance(xml_content, str):
+        return _parse_forecast_document(xml_content)
+
+    cache_key = hashlib.blake2b(xml_content, digest_size=16).digest()
+    cached = _PARSE_CACHE.get(cache_key)
+    if cached is not None:
+        _PARSE_CACHE.move_to_end(cache_key)
+        return cached
+
+    if len(xml_content) >= _STREAM_THRESHOLD:
+        parsed = parse_forecast_xml_stream(xml_content)
+    else:
+        parsed = _parse_forecast_document(xml_content)
+    if parsed is not None:
+        # Only successes are cached so malformed documents keep logging
+        # their errors on every attempt
+        _PARSE_CACHE[cache_key] = parsed
+        if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    return parsed
+
+
+def _parse_forecast_document(xml_content: bytes | str) -> Optional[ParsedForecast]:
+    """Tree-parse one document; the uncached body of parse_forecast_xml."""
+    # lxml parses these documents several times faster than the stdlib.
+    # Its fromstring only accepts bytes when the document carries an XML
+    # declaration, which matches the fetch path (bytes end to end); the
+    # rare str input and lxml-less installs use the stdlib parser.
     try:
-        root = ET.fromstring(xml_content)
-    except ET.ParseError as e:
+        if HAVE_LXML and not isinstance(xml_content, str):
+            root = _lxml_etree.fromstring(xml_content, _LXML_PARSER)
+        else:
+            root = ET.fromstring(xml_content)
+    except _XML_PARSE_ERRORS as e:
         logger.error(f"Failed to parse XML: {e}")
         return None
     
@@ -175,26 +340,36 @@ def parse_forecast_xml(xml_content: str) -> Optional[ParsedForecast]:
     issue_time_str = issue_time_elem.text.strip()
     
     try:
-        issue_time = datetime.fromisoformat(issue_time_str)
+        issue_time = _fast_parse_bom_datetime(issue_time_str)
     except ValueError as e:
         logger.error(f"Invalid issue-time-local format: {issue_time_str} - {e}")
         return None
-    
+
     # Find the forecast section
     forecast_section = root.find("forecast")
     if forecast_section is None:
         logger.error("XML missing forecast section")
         return None
     
-    # Find location and metropolitan areas
+    # Find location and metropolitan areas. Under lxml the type filter
+    # runs as a precompiled C-level XPath query instead of a Python
+    # loop over every area; state feeds carry one <area> per town, so
+    # the skip matters there. The root may still be a stdlib tree (str
+    # input), hence the hasattr check rather than HAVE_LXML alone.
+    is_lxml_tree = hasattr(forecast_section, "xpath")
+    if is_lxml_tree:
+        areas = _XP_FORECAST_AREAS(forecast_section)
+    else:
+        areas = forecast_section.findall("area")
+
     location_area = None
     metropolitan_area = None
-    
-    for area in forecast_section.findall("area"):
+
+    for area in areas:
         area_type = area.get("type")
-        if area_type == "location" and location_area is None:
+        if area_type == _T_LOCATION and location_area is None:
             location_area = area
-        elif area_type == "metropolitan":
+        elif area_type == _T_METROPOLITAN:
             metropolitan_area = area
     
     if location_area is None:
@@ -207,36 +382,189 @@ def parse_forecast_xml(xml_content: str) -> Optional[ParsedForecast]:
         logger.error("Location area missing description attribute")
         return None
     
-    # Build a map of forecast text from metropolitan area (for capital cities)
-    metro_forecasts: dict[date, str] = {}
+    # Collect the forecast text per metropolitan period (for capital
+    # cities), keeping the raw start-time string so the dates only get
+    # parsed if the positional merge below can't be used
+    metro_entries: list[tuple[Optional[str], Optional[str]]] = []
     if metropolitan_area is not None:
-        for period in metropolitan_area.findall("forecast-period"):
-            start_time_str = period.get("start-time-local")
-            if not start_time_str:
-                continue
-            try:
-                forecast_date = datetime.fromisoformat(start_time_str).date()
-            except ValueError:
-                continue
-            
+        metro_periods = (
+            _XP_FORECAST_PERIODS(metropolitan_area)
+            if is_lxml_tree
+            else metropolitan_area.findall("forecast-period")
+        )
+        for period in metro_periods:
+            metro_text = None
             for text_elem in period.findall("text"):
-                if text_elem.get("type") == "forecast" and text_elem.text:
-                    metro_forecasts[forecast_date] = text_elem.text.strip()
+                if text_elem.get("type") == _T_FORECAST and text_elem.text:
+                    metro_text = _maybe_strip(text_elem.text)
                     break
-    
+            metro_entries.append((period.get("start-time-local"), metro_text))
+
     # Parse all forecast periods from location area
     forecasts: list[ForecastDay] = []
-    for period in location_area.findall("forecast-period"):
+    location_periods = (
+        _XP_FORECAST_PERIODS(location_area)
+        if is_lxml_tree
+        else location_area.findall("forecast-period")
+    )
+
+    # BOM emits the metropolitan and location periods one-to-one in the
+    # same day order, so when the counts line up the merge is an index
+    # lookup with no date parsing at all. A count mismatch (truncated
+    # feed) falls back to keying by parsed date.
+    positional_merge = len(metro_entries) == len(location_periods)
+    metro_by_date: Optional[dict[date, str]] = None
+
+    for i, period in enumerate(location_periods):
         forecast_day = _parse_forecast_period(period)
-        if forecast_day is not None:
-            # Merge forecast text from metropolitan area if location doesn't have it
+        if forecast_day is None:
+            continue
+
+        # Merge forecast text from metropolitan area if location doesn't have it
+        if not forecast_day.forecast and metro_entries:
+            if positional_merge:
+                metro_text = metro_entries[i][1]
+                if metro_text:
+                    forecast_day.forecast = metro_text
+            else:
+                if metro_by_date is None:
+                    metro_by_date = {}
+                    for start_time_str, metro_text in metro_entries:
+                        if not start_time_str or not metro_text:
+                            continue
+                        try:
+                            metro_by_date[_parse_start_date(start_time_str)] = metro_text
+                        except ValueError:
+                            continue
+                metro_text = metro_by_date.get(forecast_day.forecast_date)
+                if metro_text:
+                    forecast_day.forecast = metro_text
+
+        forecasts.append(forecast_day)
+    
+    if not forecasts:
+        logger.warning(f"No valid forecast periods found for {product_id}")
+
+    return ParsedForecast(
+        product_id=product_id,
+        city_name=city_name,
+        issue_time=issue_time,
+        timezone=timezone,
+        forecasts=forecasts
+    )
+
+
+def parse_forecast_xml_stream(xml_content: bytes) -> Optional[ParsedForecast]:
+    """Parse BOM forecast XML in a single streaming pass.
+
+    Behaves like parse_forecast_xml but drives iterparse instead of
+    building the full tree: each forecast-period is converted to a
+    ForecastDay as its end tag arrives and then cleared, so peak memory
+    is one period's subtree rather than the whole document, and each
+    node is touched once instead of built and then re-walked with
+    findall. Worth it for the largest state feeds; results are
+    identical to the tree-based parser.
+
+    Args:
+        xml_content: Raw XML content as bytes
+
+    Returns:
+        ParsedForecast if parsing succeeds, None on failure
+    """
+    backend = _lxml_etree if HAVE_LXML else ET
+
+    product_id: Optional[str] = None
+    issue_time: Optional[datetime] = None
+    timezone = ""
+    city_name: Optional[str] = None
+    forecasts: list[ForecastDay] = []
+    metro_forecasts: dict[date, str] = {}
+
+    # Only periods inside the first type="location" area (and, for
+    # capital cities, the type="metropolitan" area) are of interest;
+    # track which one we're inside from the area start tags
+    in_location = False
+    in_metro = False
+    seen_location = False
+
+    try:
+        for event, elem in backend.iterparse(
+            io.BytesIO(xml_content), events=("start", "end")
+        ):
+            tag = elem.tag
+            if event == "start":
+                if tag == _T_AREA:
+                    area_type = elem.get("type")
+                    if area_type == _T_LOCATION and not seen_location:
+                        seen_location = True
+                        in_location = True
+                        city_name = elem.get("description", "")
+                    elif area_type == _T_METROPOLITAN:
+                        in_metro = True
+                continue
+
+            if tag == _T_FORECAST_PERIOD:
+                if in_location:
+                    forecast_day = _parse_forecast_period(elem)
+                    if forecast_day is not None:
+                        forecasts.append(forecast_day)
+                elif in_metro:
+                    start_time_str = elem.get("start-time-local")
+                    if start_time_str:
+                        try:
+                            forecast_date = _parse_start_date(start_time_str)
+                        except ValueError:
+                            forecast_date = None
+                        if forecast_date is not None:
+                            for text_elem in elem.findall("text"):
+                                if text_elem.get("type") == _T_FORECAST and text_elem.text:
+                                    metro_forecasts[forecast_date] = _maybe_strip(text_elem.text)
+                                    break
+                # Release the subtree now that it's been consumed
+                elem.clear()
+            elif tag == _T_AREA:
+                in_location = False
+                in_metro = False
+                elem.clear()
+            elif tag == _T_IDENTIFIER:
+                if elem.text:
+                    product_id = elem.text.strip()
+            elif tag == _T_ISSUE_TIME_LOCAL:
+                if elem.text:
+                    timezone = elem.get("tz", "")
+                    issue_time_str = elem.text.strip()
+                    try:
+                        issue_time = _fast_parse_bom_datetime(issue_time_str)
+                    except ValueError as e:
+                        logger.error(f"Invalid issue-time-local format: {issue_time_str} - {e}")
+                        return None
+    except _XML_PARSE_ERRORS as e:
+        logger.error(f"Failed to parse XML: {e}")
+        return None
+
+    if product_id is None:
+        logger.error("XML missing identifier in amoc section")
+        return None
+    if issue_time is None:
+        logger.error("XML missing issue-time-local in amoc section")
+        return None
+    if not seen_location:
+        logger.error("XML missing location area (type='location')")
+        return None
+    if not city_name:
+        logger.error("Location area missing description attribute")
+        return None
+
+    # Merge forecast text from the metropolitan area if the location
+    # periods don't carry it (capital-city feeds)
+    if metro_forecasts:
+        for forecast_day in forecasts:
             if not forecast_day.forecast and forecast_day.forecast_date in metro_forecasts:
                 forecast_day.forecast = metro_forecasts[forecast_day.forecast_date]
-            forecasts.append(forecast_day)
-    
+
     if not forecasts:
         logger.warning(f"No valid forecast periods found for {product_id}")
-    
+
     return ParsedForecast(
         product_id=product_id,
         city_name=city_name,
@@ -244,3 +572,35 @@ def parse_forecast_xml(xml_content: str) -> Optional[ParsedForecast]:
         timezone=timezone,
         forecasts=forecasts
     )
+
+
+# Below this many documents the process-pool spawn/pickle overhead
+# exceeds the parse time it parallelizes
+_PARALLEL_PARSE_MIN = 4
+
+
+def parse_many(
+    xml_documents: Iterable[bytes],
+    max_workers: Optional[int] = None,
+) -> list[Optional[ParsedForecast]]:
+    """Parse a batch of forecast documents, in parallel when it pays.
+
+    XML parsing holds the GIL for its Python-side portions, so a batch
+    of feeds shards across a process pool instead — each worker parses
+    independently and the dataclass results pickle back cheaply. Small
+    batches (and therefore most CLI invocations with --city) parse
+    sequentially, where pool startup would dominate.
+
+    Args:
+        xml_documents: Raw XML documents as bytes
+        max_workers: Process count for large batches (default: CPU count)
+
+    Returns:
+        One Optional[ParsedForecast] per input document, in order
+    """
+    documents = list(xml_documents)
+    if len(documents) < _PARALLEL_PARSE_MIN:
+        return [parse_forecast_xml(document) for document in documents]
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(parse_forecast_xml, documents, chunksize=4))